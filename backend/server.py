@@ -1,16 +1,23 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError, OperationFailure
 import os
+import asyncio
 import logging
+import orjson
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional
 import uuid
 from datetime import datetime, timezone, timedelta
 import jwt
+import hashlib
+import time
+from cachetools import TTLCache
 from passlib.context import CryptContext
 
 ROOT_DIR = Path(__file__).parent
@@ -18,35 +25,65 @@ load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    tz_aware=True,
+    maxPoolSize=int(os.environ.get('MONGO_MAX_POOL_SIZE', '20')),
+    minPoolSize=int(os.environ.get('MONGO_MIN_POOL_SIZE', '5')),
+    waitQueueTimeoutMS=2000,
+    serverSelectionTimeoutMS=3000,
+    compressors=os.environ.get('MONGO_COMPRESSORS', 'zstd,zlib')
+)
 db = client[os.environ['DB_NAME']]
 
 # JWT Configuration
 SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'your-secret-key-change-in-production')
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
+jwt_decoder = jwt.PyJWT()
+JWT_DECODE_OPTIONS = {"verify_aud": False, "require": ["exp", "sub"]}
+
+# Authenticated user cache: sha256(token) -> (user, token exp timestamp)
+AUTH_CACHE_TTL_SECONDS = 30
+_token_cache = TTLCache(maxsize=10000, ttl=AUTH_CACHE_TTL_SECONDS)
+# user id -> token hashes cached for that user, used for invalidation
+_user_token_hashes = {}
+
+# Unique indexes that built at startup; without one, handlers fall back to a
+# find_one pre-check instead of relying on DuplicateKeyError
+unique_index_ready = {"username": False, "attendance_point": False}
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    bcrypt__rounds=int(os.environ.get('BCRYPT_ROUNDS', '10')),
+    deprecated="auto"
+)
 security = HTTPBearer()
 
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
 # ==================== Models ====================
 
+def new_id() -> str:
+    return str(uuid.uuid4())
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
 class User(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     username: str
     password_hash: str
     full_name: str
     role: str  # "admin" or "officer"
     badge_number: Optional[str] = None
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utcnow)
 
 class UserCreate(BaseModel):
     username: str
@@ -73,13 +110,13 @@ class TokenResponse(BaseModel):
 
 class PatrolPoint(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     name: str
     description: str
     address: str
     latitude: Optional[float] = None
     longitude: Optional[float] = None
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utcnow)
 
 class PatrolPointCreate(BaseModel):
     name: str
@@ -90,11 +127,11 @@ class PatrolPointCreate(BaseModel):
 
 class Route(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     name: str
     description: str
     patrol_point_ids: List[str]  # Ordered list of patrol point IDs
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utcnow)
 
 class RouteCreate(BaseModel):
     name: str
@@ -103,12 +140,14 @@ class RouteCreate(BaseModel):
 
 class RouteAssignment(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     officer_id: str
     route_id: str
     date: str  # Format: YYYY-MM-DD
     status: str = "assigned"  # "assigned", "in_progress", "completed"
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    patrol_point_count: int = 0  # Denormalized from the route at assignment time
+    completed_count: int = 0
+    created_at: datetime = Field(default_factory=utcnow)
 
 class RouteAssignmentCreate(BaseModel):
     officer_id: str
@@ -117,11 +156,11 @@ class RouteAssignmentCreate(BaseModel):
 
 class Attendance(BaseModel):
     model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     officer_id: str
     route_assignment_id: str
     patrol_point_id: str
-    check_in_time: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    check_in_time: datetime = Field(default_factory=utcnow)
     notes: Optional[str] = None
 
 class AttendanceCreate(BaseModel):
@@ -131,47 +170,82 @@ class AttendanceCreate(BaseModel):
 
 # ==================== Auth Utilities ====================
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+# bcrypt is CPU-bound; run it in the default thread pool so it doesn't block the event loop
+async def verify_password(plain_password, hashed_password):
+    return await asyncio.to_thread(pwd_context.verify, plain_password, hashed_password)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def get_password_hash(password):
+    return await asyncio.to_thread(pwd_context.hash, password)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+# Drop every cached token for a user (call after logout/password change)
+def invalidate_cached_user(user_id: str):
+    for token_hash in _user_token_hashes.pop(user_id, ()):
+        _token_cache.pop(token_hash, None)
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    token_hash = hashlib.sha256(token.encode()).digest()
+    cached = _token_cache.get(token_hash)
+    if cached is not None:
+        user, exp = cached
+        if exp > time.time():
+            return user
+        _token_cache.pop(token_hash, None)
+
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+        payload = jwt_decoder.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options=JWT_DECODE_OPTIONS)
+        # "sub" is required by JWT_DECODE_OPTIONS; a token without it is an InvalidTokenError
+        user_id: str = payload["sub"]
         
         user = await db.users.find_one({"id": user_id}, {"_id": 0})
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
-        return user
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    # Never serve a token from cache past its own expiry
+    _token_cache[token_hash] = (user, payload.get("exp", float("inf")))
+    hashes = {h for h in _user_token_hashes.get(user_id, ()) if h in _token_cache}
+    hashes.add(token_hash)
+    _user_token_hashes[user_id] = hashes
+    return user
+
+# ==================== Response Cache ====================
+
+# Patrol points and routes carry a version counter in the meta collection, bumped on
+# every write, so clients can revalidate them with If-None-Match instead of refetching
+async def bump_collection_version(name: str):
+    await db.meta.update_one({"_id": f"{name}_ver"}, {"$inc": {"version": 1}}, upsert=True)
+
+async def get_collection_etag(name: str) -> str:
+    meta = await db.meta.find_one({"_id": f"{name}_ver"})
+    return f'W/"{meta["version"] if meta else 0}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match", "")
+    return etag in (tag.strip() for tag in if_none_match.split(","))
+
 # ==================== Auth Routes ====================
 
 @api_router.post("/auth/register", response_model=UserResponse)
 async def register(user_data: UserCreate):
-    # Check if username exists
-    existing = await db.users.find_one({"username": user_data.username}, {"_id": 0})
-    if existing:
-        raise HTTPException(status_code=400, detail="Username already exists")
+    # Check if username exists (only needed when the unique index couldn't be built)
+    if not unique_index_ready["username"]:
+        existing = await db.users.find_one({"username": user_data.username}, {"_id": 1})
+        if existing:
+            raise HTTPException(status_code=400, detail="Username already exists")
     
     # Create user
-    password_hash = get_password_hash(user_data.password)
+    password_hash = await get_password_hash(user_data.password)
     user = User(
         username=user_data.username,
         password_hash=password_hash,
@@ -181,8 +255,11 @@ async def register(user_data: UserCreate):
     )
     
     doc = user.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    await db.users.insert_one(doc)
+    try:
+        await db.users.insert_one(doc)
+    except DuplicateKeyError:
+        # Unique index on username
+        raise HTTPException(status_code=400, detail="Username already exists")
     
     return UserResponse(
         id=user.id,
@@ -195,7 +272,7 @@ async def register(user_data: UserCreate):
 @api_router.post("/auth/login", response_model=TokenResponse)
 async def login(login_data: UserLogin):
     user = await db.users.find_one({"username": login_data.username}, {"_id": 0})
-    if not user or not verify_password(login_data.password, user["password_hash"]):
+    if not user or not await verify_password(login_data.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid username or password")
     
     access_token = create_access_token(data={"sub": user["id"]})
@@ -229,18 +306,37 @@ async def create_patrol_point(point_data: PatrolPointCreate, current_user: dict
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Only admins can create patrol points")
     
-    point = PatrolPoint(**point_data.model_dump())
-    doc = point.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
+    doc = {"id": new_id(), **point_data.model_dump(), "created_at": utcnow()}
     await db.patrol_points.insert_one(doc)
-    return point
+    await bump_collection_version("patrol_points")
+    return doc
+
+@api_router.post("/patrol-points/bulk", response_model=List[PatrolPoint])
+async def create_patrol_points_bulk(points_data: List[PatrolPointCreate], current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can create patrol points")
+    
+    if not points_data:
+        return []
+    
+    now = utcnow()
+    docs = [{"id": new_id(), **point_data.model_dump(), "created_at": now} for point_data in points_data]
+    # Unordered so the server can apply the inserts without stopping at the first error
+    await db.patrol_points.insert_many(docs, ordered=False)
+    await bump_collection_version("patrol_points")
+    return docs
 
 @api_router.get("/patrol-points", response_model=List[PatrolPoint])
-async def get_patrol_points(current_user: dict = Depends(get_current_user)):
-    points = await db.patrol_points.find({}, {"_id": 0}).to_list(1000)
-    for point in points:
-        if isinstance(point['created_at'], str):
-            point['created_at'] = datetime.fromisoformat(point['created_at'])
+async def get_patrol_points(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+    etag = await get_collection_etag("patrol_points")
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    points = await db.patrol_points.find(
+        {},
+        {"_id": 0, "id": 1, "name": 1, "description": 1, "address": 1, "latitude": 1, "longitude": 1, "created_at": 1}
+    ).to_list(1000)
     return points
 
 @api_router.delete("/patrol-points/{point_id}")
@@ -251,6 +347,7 @@ async def delete_patrol_point(point_id: str, current_user: dict = Depends(get_cu
     result = await db.patrol_points.delete_one({"id": point_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Patrol point not found")
+    await bump_collection_version("patrol_points")
     return {"message": "Patrol point deleted successfully"}
 
 # ==================== Routes (Patrol Routes) ====================
@@ -260,18 +357,19 @@ async def create_route(route_data: RouteCreate, current_user: dict = Depends(get
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Only admins can create routes")
     
-    route = Route(**route_data.model_dump())
-    doc = route.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
+    doc = {"id": new_id(), **route_data.model_dump(), "created_at": utcnow()}
     await db.routes.insert_one(doc)
-    return route
+    await bump_collection_version("routes")
+    return doc
 
 @api_router.get("/routes", response_model=List[Route])
-async def get_routes(current_user: dict = Depends(get_current_user)):
+async def get_routes(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+    etag = await get_collection_etag("routes")
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
     routes = await db.routes.find({}, {"_id": 0}).to_list(1000)
-    for route in routes:
-        if isinstance(route['created_at'], str):
-            route['created_at'] = datetime.fromisoformat(route['created_at'])
     return routes
 
 @api_router.delete("/routes/{route_id}")
@@ -282,6 +380,7 @@ async def delete_route(route_id: str, current_user: dict = Depends(get_current_u
     result = await db.routes.delete_one({"id": route_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Route not found")
+    await bump_collection_version("routes")
     return {"message": "Route deleted successfully"}
 
 # ==================== Route Assignments ====================
@@ -291,11 +390,20 @@ async def create_route_assignment(assignment_data: RouteAssignmentCreate, curren
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Only admins can assign routes")
     
-    assignment = RouteAssignment(**assignment_data.model_dump())
-    doc = assignment.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
+    route = await db.routes.find_one({"id": assignment_data.route_id}, {"_id": 0, "patrol_point_ids": 1})
+    if not route:
+        raise HTTPException(status_code=404, detail="Route not found")
+    
+    doc = {
+        "id": new_id(),
+        **assignment_data.model_dump(),
+        "status": "assigned",
+        "patrol_point_count": len(route["patrol_point_ids"]),
+        "completed_count": 0,
+        "created_at": utcnow()
+    }
     await db.route_assignments.insert_one(doc)
-    return assignment
+    return doc
 
 @api_router.get("/route-assignments", response_model=List[RouteAssignment])
 async def get_route_assignments(current_user: dict = Depends(get_current_user)):
@@ -304,9 +412,6 @@ async def get_route_assignments(current_user: dict = Depends(get_current_user)):
         query["officer_id"] = current_user["id"]
     
     assignments = await db.route_assignments.find(query, {"_id": 0}).to_list(1000)
-    for assignment in assignments:
-        if isinstance(assignment['created_at'], str):
-            assignment['created_at'] = datetime.fromisoformat(assignment['created_at'])
     return assignments
 
 @api_router.get("/route-assignments/today")
@@ -314,7 +419,7 @@ async def get_today_assignment(current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "officer":
         raise HTTPException(status_code=403, detail="Only officers can access this endpoint")
     
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    today = utcnow().strftime("%Y-%m-%d")
     assignment = await db.route_assignments.find_one(
         {"officer_id": current_user["id"], "date": today},
         {"_id": 0}
@@ -323,8 +428,14 @@ async def get_today_assignment(current_user: dict = Depends(get_current_user)):
     if not assignment:
         return {"message": "No route assigned for today"}
     
-    # Get route details
-    route = await db.routes.find_one({"id": assignment["route_id"]}, {"_id": 0})
+    # Get route details and attendance for today concurrently
+    route, attendance_records = await asyncio.gather(
+        db.routes.find_one({"id": assignment["route_id"]}, {"_id": 0}),
+        db.attendance.find(
+            {"route_assignment_id": assignment["id"]},
+            {"_id": 0}
+        ).to_list(1000)
+    )
     if not route:
         raise HTTPException(status_code=404, detail="Route not found")
     
@@ -334,18 +445,13 @@ async def get_today_assignment(current_user: dict = Depends(get_current_user)):
         {"_id": 0}
     ).to_list(1000)
     
-    # Get attendance for today
-    attendance_records = await db.attendance.find(
-        {"route_assignment_id": assignment["id"]},
-        {"_id": 0}
-    ).to_list(1000)
-    
-    completed_point_ids = [att["patrol_point_id"] for att in attendance_records]
+    completed_point_ids = {att["patrol_point_id"] for att in attendance_records}
     
     # Order patrol points and mark completed
+    points_by_id = {p["id"]: p for p in patrol_points}
     ordered_points = []
     for point_id in route["patrol_point_ids"]:
-        point = next((p for p in patrol_points if p["id"] == point_id), None)
+        point = points_by_id.get(point_id)
         if point:
             point["completed"] = point_id in completed_point_ids
             ordered_points.append(point)
@@ -371,72 +477,110 @@ async def mark_attendance(attendance_data: AttendanceCreate, current_user: dict
     if not assignment:
         raise HTTPException(status_code=404, detail="Route assignment not found")
     
-    # Check if already marked
-    existing = await db.attendance.find_one(
-        {
-            "route_assignment_id": attendance_data.route_assignment_id,
-            "patrol_point_id": attendance_data.patrol_point_id
-        },
-        {"_id": 0}
-    )
-    if existing:
-        raise HTTPException(status_code=400, detail="Attendance already marked for this point")
-    
-    attendance = Attendance(
-        officer_id=current_user["id"],
-        route_assignment_id=attendance_data.route_assignment_id,
-        patrol_point_id=attendance_data.patrol_point_id,
-        notes=attendance_data.notes
-    )
+    # Check if already marked (only needed when the unique index couldn't be built)
+    if not unique_index_ready["attendance_point"]:
+        existing = await db.attendance.find_one(
+            {
+                "route_assignment_id": attendance_data.route_assignment_id,
+                "patrol_point_id": attendance_data.patrol_point_id
+            },
+            {"_id": 1}
+        )
+        if existing:
+            raise HTTPException(status_code=400, detail="Attendance already marked for this point")
     
-    doc = attendance.model_dump()
-    doc['check_in_time'] = doc['check_in_time'].isoformat()
-    await db.attendance.insert_one(doc)
+    doc = {
+        "id": new_id(),
+        "officer_id": current_user["id"],
+        **attendance_data.model_dump(),
+        "check_in_time": utcnow()
+    }
+    try:
+        await db.attendance.insert_one(doc)
+    except DuplicateKeyError:
+        # Unique index on (route_assignment_id, patrol_point_id)
+        raise HTTPException(status_code=400, detail="Attendance already marked for this point")
     
     # Update assignment status
-    route = await db.routes.find_one({"id": assignment["route_id"]}, {"_id": 0})
-    if route:
-        attendance_count = await db.attendance.count_documents({"route_assignment_id": attendance_data.route_assignment_id})
-        if attendance_count >= len(route["patrol_point_ids"]):
-            await db.route_assignments.update_one(
-                {"id": attendance_data.route_assignment_id},
-                {"$set": {"status": "completed"}}
-            )
-        elif attendance_count > 0:
-            await db.route_assignments.update_one(
-                {"id": attendance_data.route_assignment_id},
-                {"$set": {"status": "in_progress"}}
-            )
-    
-    return attendance
+    if "patrol_point_count" in assignment:
+        # Bump the completed counter and derive the status in a single update
+        await db.route_assignments.update_one(
+            {"id": attendance_data.route_assignment_id},
+            [
+                {"$set": {"completed_count": {"$add": [{"$ifNull": ["$completed_count", 0]}, 1]}}},
+                {"$set": {"status": {"$cond": [
+                    {"$gte": ["$completed_count", "$patrol_point_count"]},
+                    "completed",
+                    "in_progress"
+                ]}}}
+            ]
+        )
+    else:
+        # Assignments created before patrol_point_count was stored
+        route = await db.routes.find_one({"id": assignment["route_id"]}, {"_id": 0})
+        if route:
+            attendance_count = await db.attendance.count_documents({"route_assignment_id": attendance_data.route_assignment_id})
+            if attendance_count >= len(route["patrol_point_ids"]):
+                await db.route_assignments.update_one(
+                    {"id": attendance_data.route_assignment_id},
+                    {"$set": {"status": "completed"}}
+                )
+            elif attendance_count > 0:
+                await db.route_assignments.update_one(
+                    {"id": attendance_data.route_assignment_id},
+                    {"$set": {"status": "in_progress"}}
+                )
+    
+    return doc
 
 @api_router.get("/attendance")
 async def get_all_attendance(current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Only admins can view all attendance")
     
-    # Get all attendance records
-    attendance_records = await db.attendance.find({}, {"_id": 0}).to_list(10000)
+    # Join officer, patrol point and assignment details in a single aggregation
+    pipeline = [
+        {"$project": {
+            "_id": 0,
+            "id": 1,
+            "officer_id": 1,
+            "patrol_point_id": 1,
+            "route_assignment_id": 1,
+            "check_in_time": 1,
+            "notes": 1
+        }},
+        {"$lookup": {"from": "users", "localField": "officer_id", "foreignField": "id", "as": "officer"}},
+        {"$lookup": {"from": "patrol_points", "localField": "patrol_point_id", "foreignField": "id", "as": "patrol_point"}},
+        {"$lookup": {"from": "route_assignments", "localField": "route_assignment_id", "foreignField": "id", "as": "assignment"}},
+        {"$project": {
+            "_id": 0,
+            "id": 1,
+            "officer_name": {"$ifNull": [{"$arrayElemAt": ["$officer.full_name", 0]}, "Unknown"]},
+            "badge_number": {"$ifNull": [{"$arrayElemAt": ["$officer.badge_number", 0]}, None]},
+            "patrol_point_name": {"$ifNull": [{"$arrayElemAt": ["$patrol_point.name", 0]}, "Unknown"]},
+            "patrol_point_address": {"$ifNull": [{"$arrayElemAt": ["$patrol_point.address", 0]}, "Unknown"]},
+            "check_in_time": 1,
+            "notes": {"$ifNull": ["$notes", None]},
+            "date": {"$ifNull": [{"$arrayElemAt": ["$assignment.date", 0]}, None]}
+        }}
+    ]
     
-    # Enrich with user and patrol point details
-    result = []
-    for record in attendance_records:
-        officer = await db.users.find_one({"id": record["officer_id"]}, {"_id": 0})
-        patrol_point = await db.patrol_points.find_one({"id": record["patrol_point_id"]}, {"_id": 0})
-        assignment = await db.route_assignments.find_one({"id": record["route_assignment_id"]}, {"_id": 0})
-        
-        result.append({
-            "id": record["id"],
-            "officer_name": officer["full_name"] if officer else "Unknown",
-            "badge_number": officer.get("badge_number") if officer else None,
-            "patrol_point_name": patrol_point["name"] if patrol_point else "Unknown",
-            "patrol_point_address": patrol_point["address"] if patrol_point else "Unknown",
-            "check_in_time": record["check_in_time"],
-            "notes": record.get("notes"),
-            "date": assignment["date"] if assignment else None
-        })
-    
-    return result
+    # Stream the JSON array straight from the cursor instead of buffering every record.
+    # The first record is fetched up front so a failing aggregation still returns a 500
+    # rather than a 200 with a truncated body.
+    cursor = db.attendance.aggregate(pipeline)
+    first = await anext(cursor, None)
+    
+    async def stream_records():
+        yield b"["
+        if first is not None:
+            yield orjson.dumps(first)
+            async for record in cursor:
+                yield b","
+                yield orjson.dumps(record)
+        yield b"]"
+    
+    return StreamingResponse(stream_records(), media_type="application/json")
 
 # ==================== Users (Officers) Management ====================
 
@@ -445,7 +589,10 @@ async def get_officers(current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Only admins can view officers")
     
-    officers = await db.users.find({"role": "officer"}, {"_id": 0, "password_hash": 0}).to_list(1000)
+    officers = await db.users.find(
+        {"role": "officer"},
+        {"_id": 0, "id": 1, "username": 1, "full_name": 1, "role": 1, "badge_number": 1}
+    ).to_list(1000)
     return [UserResponse(**officer) for officer in officers]
 
 # Include the router in the main app
@@ -466,6 +613,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def ensure_index(collection, keys, **kwargs) -> bool:
+    # Databases written before the unique indexes existed can hold duplicates; log and
+    # keep serving instead of failing startup. The caller records the result so the
+    # handlers keep their find_one duplicate checks until the index exists.
+    try:
+        await collection.create_index(keys, **kwargs)
+        return True
+    except OperationFailure as e:
+        logger.error(f"Could not create index {keys} on {collection.name}: {e}")
+        return False
+
+@app.on_event("startup")
+async def create_indexes():
+    await ensure_index(db.users, "id", unique=True)
+    unique_index_ready["username"] = await ensure_index(db.users, "username", unique=True)
+    await ensure_index(db.users, "role")
+    await ensure_index(db.patrol_points, "id", unique=True)
+    await ensure_index(db.routes, "id", unique=True)
+    await ensure_index(db.route_assignments, "id", unique=True)
+    await ensure_index(db.route_assignments, [("officer_id", 1), ("date", 1)])
+    unique_index_ready["attendance_point"] = await ensure_index(
+        db.attendance,
+        [("route_assignment_id", 1), ("patrol_point_id", 1)],
+        unique=True
+    )
+    await ensure_index(db.attendance, "officer_id")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
\ No newline at end of file